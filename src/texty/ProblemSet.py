@@ -31,6 +31,10 @@ class ProblemSet(object):
         wrong: (int) The number of times the user has gotten this problem
             wrong.
         history: (list<tuple>) The history of the answers to this problem.
+        problem_totals: (dict<int, list>) The number right and wrong for
+            each problem, from history which has been compacted.
+        daily_totals: (dict<str, list>) The number right and wrong on
+            each day, from history which has been compacted.
     """
 
     def __init__(self, chapter=0, section=0, problems=0,
@@ -54,6 +58,8 @@ class ProblemSet(object):
         self.right = right
         self.wrong = wrong
         self.history = list()
+        self.problem_totals = dict()
+        self.daily_totals = dict()
 
     def normalize(self):
         """Normalize the members to give them all the same types.
@@ -64,6 +70,11 @@ class ProblemSet(object):
         self.chapter = _coerce(self.chapter)
         self.section = _coerce(self.section)
         self.problems = _coerce(self.problems)
+        # Sets pickled before compaction existed lack its totals.
+        if not hasattr(self, 'problem_totals'):
+            self.problem_totals = dict()
+        if not hasattr(self, 'daily_totals'):
+            self.daily_totals = dict()
         return self
 
     def init_line(self, line,
@@ -91,6 +102,8 @@ class ProblemSet(object):
         self.right = dkey["right"]
         self.wrong = dkey["wrong"]
         self.history = list()
+        self.problem_totals = dict()
+        self.daily_totals = dict()
 
     def mark_wrong(self, problem):
         """Mark the given problem wrong."""
@@ -123,6 +136,33 @@ class ProblemSet(object):
         """
         return self.history
 
+    def compact(self, cutoff):
+        """Compact the history from before the cutoff into totals.
+
+        Answers older than the cutoff are removed from the history and
+        added to problem_totals and daily_totals.  The right and wrong
+        counts are unchanged.
+
+        Args:
+            cutoff: A datetime.  Answers recorded before it are compacted.
+
+        Returns:
+            The number of answers compacted.
+        """
+        cutoff = str(cutoff)
+        kept = list()
+        compacted = 0
+        for timestamp, result, problem in self.history:
+            if timestamp >= cutoff:
+                kept.append((timestamp, result, problem))
+                continue
+            column = 0 if result > 0 else 1
+            self.problem_totals.setdefault(problem, [0, 0])[column] += 1
+            self.daily_totals.setdefault(timestamp[:10], [0, 0])[column] += 1
+            compacted += 1
+        self.history = kept
+        return compacted
+
     def __lt__(self, ps):
         """Compare two problem sets by chapter, then section.
 
@@ -155,10 +195,18 @@ class ProblemSet(object):
                                     self.right, self.wrong]]
         return '\t'.join(retlist)
 
-    def str_rand_problem(self, custom_filter):
-        """Return a random problem within this problem set."""
+    def str_rand_problem(self, custom_filter, rand=random):
+        """Return a random problem within this problem set.
+
+        Args:
+            custom_filter: A predicate restricting which problem numbers
+                may be chosen.
+            rand: The source of randomness.  Defaults to the random
+                module; pass an instance of Random for a reproducible
+                stream.
+        """
         ret = self.__str__().split('\t')
         prob_range = range(int(ret[2]))
-        i = random.choice(list(filter(custom_filter, prob_range)))
+        i = rand.choice(list(filter(custom_filter, prob_range)))
         ret[2] = str(i)
         return '\t'.join(ret)
@@ -2,7 +2,9 @@
 Defines the ProblemSetManager.
 """
 
+import datetime
 import math
+import multiprocessing
 import random
 import pickle
 import sys
@@ -14,6 +16,59 @@ def get_headers():
     return 'ch.\tsect.\tprob.\tpage\tright\twrong'
 
 
+# The number of days of answers kept in full when compacting history.
+DEFAULT_RETENTION_DAYS = 90
+
+
+def get_problem_filter(parity=None):
+    """Return a predicate restricting problem numbers by parity.
+
+    Args:
+        parity: 'odd' or 'even' to restrict problems accordingly.  Any
+            other value allows every problem.
+    """
+    if parity == 'odd':
+        return lambda x: (x & 1) == 1
+    elif parity == 'even':
+        return lambda x: (x & 1) == 0
+    return lambda x: True
+
+
+# The ProblemSets shared by a worksheet worker process.  Set once per
+# process by _init_worksheet_worker, so that they aren't pickled and sent
+# along with every sheet.
+_WORKSHEET_PROBLEM_SETS = None
+
+
+def _init_worksheet_worker(problem_sets):
+    """Store the ProblemSets for this worksheet worker process."""
+    global _WORKSHEET_PROBLEM_SETS
+    _WORKSHEET_PROBLEM_SETS = problem_sets
+
+
+def _generate_worksheet(job):
+    """Generate a single worksheet in a worker process.
+
+    Args:
+        job: A tuple of (seed, index, problems, parity).  The sheet's
+            random stream is derived from the seed and its index alone,
+            so a sheet is the same no matter which process builds it.
+
+    Returns:
+        A list of lines, one per problem, without the header.
+    """
+    seed, index, problems, parity = job
+    psm = ProblemSetManager(filetype=None)
+    psm.problem_sets = _WORKSHEET_PROBLEM_SETS
+    psm.rand = random.Random('{}:{}'.format(seed, index))
+    custom_filter = get_problem_filter(parity)
+    return [
+        psm.random_problem_set_weighted().str_rand_problem(
+            custom_filter, psm.rand)
+        for _ in range(problems)
+    ]
+
+
 class ProblemSetManager(object):
     """Loads ProblemSets and performs operations on them.
 
@@ -180,6 +235,18 @@ class ProblemSetManager(object):
         """
         self.problem_sets[self.index(chapter, section)].mark_right(problem)
 
+    def compact_history(self, days=DEFAULT_RETENTION_DAYS):
+        """Compact the history of every ProblemSet older than days.
+
+        Args:
+            days: The number of days of answers to keep in full.
+
+        Returns:
+            The number of answers compacted.
+        """
+        cutoff = datetime.datetime.now() - datetime.timedelta(days=days)
+        return sum(ps.compact(cutoff) for ps in self.problem_sets)
+
     def weighted_num(self, mean, sigma):
         """Return a number weighted arount mu with stdev. of sigma.
 
@@ -222,6 +289,32 @@ class ProblemSetManager(object):
         pnum = self.trimmed_weighted_num(mean, sigma, minimum, maximum)
         return self.problem_sets[int(pnum)]
 
+    def generate_worksheets(self, seed, sheets, problems,
+                            parity=None, processes=None):
+        """Generate many worksheets of random problems in parallel.
+
+        Each sheet draws from its own Random, seeded from the seed and
+        the sheet's index, so the same arguments always produce the
+        same sheets.
+
+        Args:
+            seed: The seed from which every sheet's stream is derived.
+            sheets: The number of worksheets to generate.
+            problems: The number of problems on each worksheet.
+            parity: 'odd' or 'even' to only generate those problems.
+            processes: The number of worker processes.  Defaults to the
+                number of CPUs.
+
+        Yields:
+            A list of lines for each worksheet, in order.
+        """
+        jobs = [(seed, i, problems, parity) for i in range(sheets)]
+        with multiprocessing.Pool(processes,
+                                  _init_worksheet_worker,
+                                  (self.problem_sets,)) as pool:
+            for sheet in pool.imap(_generate_worksheet, jobs):
+                yield sheet
+
     def __str__(self):
         return (get_headers() +
                 '\n' +
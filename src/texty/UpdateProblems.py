@@ -6,14 +6,17 @@ import datetime
 import re
 import sys
 import os
+import random
 
 import json
 from json import JSONDecodeError
 from pkg_resources import resource_string
 
 from .ProblemSetManager import (
+    DEFAULT_RETENTION_DAYS,
     ProblemSetManager,
     get_headers,
+    get_problem_filter,
 )
 
 
@@ -152,6 +155,17 @@ def mark_problem_incorrect(psm):
                 print("Problem not in problem set!")
 
 
+def compact_history(psm):
+    """Compact answers older than the retention period."""
+    if ARGS.compact and psm is not None:
+        days = DEFAULT_RETENTION_DAYS
+        if ARGS.compact is not True:
+            days = int(ARGS.compact)
+        compacted = psm.compact_history(days)
+        print('Compacted {} answers older than {} days.'.format(
+            compacted, days))
+
+
 def sort_save_and_close(psm, filename, timestamp):
     """Sort, save, and close the ProblemSetManager."""
     if psm is not None:
@@ -168,23 +182,59 @@ def sort_save_and_close(psm, filename, timestamp):
             ARGS.a,
             ARGS.d,
             ARGS.edit,
+            ARGS.compact,
         ]):
             psm.save_to_pickle()
 
 
+def get_parity():
+    """Get the parity of problems requested by the user, if any."""
+    if ARGS.o and not ARGS.e:
+        return 'odd'
+    elif ARGS.e and not ARGS.o:
+        return 'even'
+    return None
+
+
 def print_random_problems(psm):
     """Print the random problems requested from the user."""
-    if ARGS.r and psm is not None:
-        custom_filter = lambda x: True
-        if ARGS.o and not ARGS.e:
-            custom_filter = lambda x: (x & 1) == 1
-        elif ARGS.e and not ARGS.o:
-            custom_filter = lambda x: (x & 1) == 0
+    if ARGS.r and psm is not None and not ARGS.worksheets:
+        custom_filter = get_problem_filter(get_parity())
         print(get_headers())
         for _ in range(int(ARGS.r)):
             rand_prob_set = psm.random_problem_set_weighted()
             print(rand_prob_set.str_rand_problem(custom_filter))
 
+def write_worksheets(psm, filename):
+    """Write the worksheets requested from the user, one file per sheet.
+
+    Each sheet has ARGS.r problems (or 10, if not given.)  If no seed was
+    given, one is chosen and printed so the sheets can be reproduced.
+    """
+    if ARGS.worksheets and psm is not None:
+        seed = ARGS.seed
+        if seed is not None:
+            seed = int(seed)
+        else:
+            seed = random.randrange(2**32)
+            print('Seed: {}'.format(seed))
+        problems = int(ARGS.r) if ARGS.r else 10
+        sheets = psm.generate_worksheets(
+            seed,
+            int(ARGS.worksheets),
+            problems,
+            get_parity(),
+        )
+        width = len(str(int(ARGS.worksheets)))
+        for i, sheet in enumerate(sheets, 1):
+            ofilename = '{}_sheet_{}.txt'.format(filename, str(i).zfill(width))
+            with open(ofilename, 'w') as fout:
+                fout.write(get_headers() + '\n')
+                for line in sheet:
+                    fout.write(line + '\n')
+            print(ofilename)
+
+
 def print_all_problem_sets(psm):
     """Print all of the Problem Sets."""
     if ARGS.p and psm is not None:
@@ -220,7 +270,9 @@ def _main():
     print_problem_sets(psm)
     mark_problem_correct(psm)
     mark_problem_incorrect(psm)
+    compact_history(psm)
     sort_save_and_close(psm, filename, timestamp)
     print_random_problems(psm)
+    write_worksheets(psm, filename)
     print_all_problem_sets(psm)
     print_descriptive_statistics(psm)